@@ -19,7 +19,7 @@ import asyncio
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from juju.action import Action
 from juju.application import Application
@@ -87,14 +87,14 @@ async def _run_action(
 
 
 def run_action_on_units(
-    units: List[Unit],
+    units: Iterable[Unit],
     action: str,
     use_cache: bool = True,
     params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Action]:
     """Run Juju action on specified units.
 
-    :param units: List/Tuple of Unit object
+    :param units: Iterable (e.g. List/Tuple) of Unit object
     :param action: Action to run on units
     :param use_cache: Use the cache to gather the result of the action
     :param params: Additional parameters for the action
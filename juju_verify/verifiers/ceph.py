@@ -15,11 +15,11 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see https://www.gnu.org/licenses/.
 """ceph-osd verification."""
-import json
 import logging
 import os
 from collections import defaultdict
-from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
 
 from juju.action import Action
 from juju.unit import Unit
@@ -30,7 +30,6 @@ from juju_verify.utils.action import data_from_action
 from juju_verify.utils.unit import (
     find_unit_by_hostname,
     get_first_active_unit,
-    run_action_on_unit,
     run_action_on_units,
     run_command_on_unit,
     verify_charm_unit,
@@ -38,22 +37,31 @@ from juju_verify.utils.unit import (
 from juju_verify.verifiers.base import BaseVerifier
 from juju_verify.verifiers.result import Result, Severity, checks_executor
 
+try:
+    # NOTE: orjson is an optional dependency, which speeds up parsing of the large
+    # action outputs, e.g. `show-disk-free`
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
-CEPH_CRUSH_TYPES = {
-    # <crush-type>: <crush-type_id>
-    "root": 10,
-    "region": 9,
-    "datacenter": 8,
-    "room": 7,
-    "pod": 6,
-    "pdu": 5,
-    "row": 4,
-    "rack": 3,
-    "chassis": 2,
-    "host": 1,
-    "osd": 0,
-}
+CEPH_CRUSH_TYPES = MappingProxyType(
+    {
+        # <crush-type>: <crush-type_id>
+        "root": 10,
+        "region": 9,
+        "datacenter": 8,
+        "room": 7,
+        "pod": 6,
+        "pdu": 5,
+        "row": 4,
+        "rack": 3,
+        "chassis": 2,
+        "host": 1,
+        "osd": 0,
+    }
+)
 
 CRUSH_RULE_DEVICE_TYPES = {
     "default": None,
@@ -123,27 +131,43 @@ class NodeInfo(NamedTuple):
         return f"{self.type_id}-{self.name}({self.id})"
 
     def __hash__(self) -> int:
-        """Return hash representation of Node."""
-        return hash(self.__str__())
+        """Return hash representation of Node.
+
+        The hash is computed from the same fields as the string representation, but
+        without formatting the string each time, since NodeInfo is used as a key.
+        """
+        return hash((self.type_id, self.name, self.id))
 
 
 class CephTree:
     """Ceph tree."""
 
+    __slots__ = (
+        "_nodes",
+        "_nodes_name_map",
+        "_parent_of",
+        "_host_names",
+        "_ancestors_map",
+        "_str",
+        "_hash",
+    )
+
     # list of supported ancestor types (for the host) based on the failure domain in
     # the replication rule, where the ancestor type is the same as the failure domain
     # except for failure-domain=host -> ancestor=root
-    SUPPORTED_ANCESTOR_TYPES = [
-        "root",
-        "region",
-        "datacenter",
-        "room",
-        "pod",
-        "pdu",
-        "row",
-        "rack",
-        "chassis",
-    ]
+    SUPPORTED_ANCESTOR_TYPES: FrozenSet[str] = frozenset(
+        {
+            "root",
+            "region",
+            "datacenter",
+            "room",
+            "pod",
+            "pdu",
+            "row",
+            "rack",
+            "chassis",
+        }
+    )
 
     def __init__(self, nodes: List[NodeInfo]):
         """Availability zone initialization.
@@ -154,6 +178,17 @@ class CephTree:
         """
         self._nodes = nodes
         self._nodes_name_map = {node.name: index for index, node in enumerate(nodes)}
+        # map between the node id and the index of its parent node
+        self._parent_of: Dict[int, int] = {}
+        for index, node in enumerate(nodes):
+            for child_id in node.children or ():
+                self._parent_of.setdefault(child_id, index)
+
+        self._host_names = frozenset(node.name for node in nodes if node.type == "host")
+        self._ancestors_map = self._get_ancestors_map()
+
+        self._str: Optional[str] = None
+        self._hash: Optional[int] = None
 
     def __eq__(self, other: object) -> bool:
         """Compare two Result instances."""
@@ -163,15 +198,27 @@ class CephTree:
         return self.nodes == other._nodes
 
     def __str__(self) -> str:
-        """Return string representation of CephTree objects."""
-        return ",".join(
-            str(node)
-            for node in sorted(self.nodes, key=lambda node: node.type_id, reverse=True)
-        )
+        """Return string representation of CephTree objects.
+
+        The nodes are not changed after initialization, so the string is created
+        only once.
+        """
+        if self._str is None:
+            self._str = ",".join(
+                str(node)
+                for node in sorted(
+                    self.nodes, key=lambda node: node.type_id, reverse=True
+                )
+            )
+
+        return self._str
 
     def __hash__(self) -> int:
         """Return hash representation of CephTree objects."""
-        return hash(self.__str__())
+        if self._hash is None:
+            self._hash = hash(self.__str__())
+
+        return self._hash
 
     @property
     def nodes(self) -> List[NodeInfo]:
@@ -180,21 +227,16 @@ class CephTree:
 
     def get_node(self, name: str) -> NodeInfo:
         """Get node by name."""
-        if name not in self._nodes_name_map.keys():
+        index = self._nodes_name_map.get(name)
+        if index is None:
             raise KeyError(f"Node {name} was not found.")
 
-        try:
-            node = self.nodes[self._nodes_name_map[name]]
-            assert node.name == name  # check that variable _nodes was not changed
-            return node
-        except (IndexError, AssertionError) as error:
-            raise ValueError("Private value `_nodes` was changed.") from error
+        return self.nodes[index]
 
     def find_ancestor(self, node: NodeInfo, required_type: str) -> Optional[NodeInfo]:
         """Find ancestor with the desired type.
 
-        This function will recursively search for the parent node until the parent
-        is of the desired type.
+        This function will find the nearest parent node of the desired type.
         Example:
         {"id": -1, "name": "root", "children": [-2, -3], ...},
         {"id": -2, "name": "rack.0", "children": [-4, -5], ...},
@@ -204,21 +246,44 @@ class CephTree:
         {"id": -3, "name": "rack.1", "children": [-6, -7], ...},
         ...
 
-        The request is to find the `root` ancestor for the `host.0`.
-        The first step is to find a parent who has id=-4 among its children, then
-        check if it is root. The parent node found is of the rack type with id=-2,
-        so the first step is repeated for this node until the parent node is of the
-        root type.
+        The nearest ancestors of each type are precomputed for all nodes during the
+        initialization (see `_get_ancestors_map`), e.g. the map for the tree above
+        contains:
+        -2 (rack.0): {"root": <root>}
+        -4 (host.0): {"root": <root>, "rack": <rack.0>}
+
+        The request to find the `root` ancestor for the `host.0` is then only
+        a lookup of the `root` type in the map for the node with id=-4. If the node
+        has no ancestor of the desired type, None is returned.
         """
-        for _node in self.nodes:
-            if _node.children and node.id in _node.children:
-                if _node.type != required_type:
-                    # continue searching for the parent for the currently found node
-                    return self.find_ancestor(_node, required_type)
+        return self._ancestors_map.get(node.id, {}).get(required_type)
 
-                return _node
+    def _get_ancestors_map(self) -> Dict[int, Dict[str, NodeInfo]]:
+        """Get a map between the node id and its nearest ancestor of each type.
 
-        return None
+        The map is created by walking the tree from the top nodes (nodes without
+        parent) down, where each child inherits the ancestors of its parent along
+        with the parent itself.
+        """
+        ids_map = {node.id: index for index, node in enumerate(self.nodes)}
+        ancestors_map: Dict[int, Dict[str, NodeInfo]] = {}
+        stack: List[Tuple[int, Dict[str, NodeInfo]]] = [
+            (index, {})
+            for index, node in enumerate(self.nodes)
+            if node.id not in self._parent_of
+        ]
+        while stack:
+            index, ancestors = stack.pop()
+            node = self.nodes[index]
+            ancestors_map[node.id] = ancestors
+            children_ancestors = {**ancestors, node.type: node}
+            for child_id in node.children or ():
+                child_index = ids_map.get(child_id)
+                # the child is visited only from its parent in the `_parent_of` map
+                if child_index is not None and self._parent_of[child_id] == index:
+                    stack.append((child_index, children_ancestors))
+
+        return ancestors_map
 
     def can_remove_host_node(
         self, *names: str, required_ancestor_type: str = "root"
@@ -228,28 +293,43 @@ class CephTree:
             raise ValueError(f"`{required_ancestor_type}` is not supported")
 
         # names allowed are of the type "host", which matches Juju units
-        if not all(self.get_node(name).type == "host" for name in names):
+        not_host_names = set(names) - self._host_names
+        missing_names = not_host_names - self._nodes_name_map.keys()
+        if missing_names:
+            raise KeyError(f"Nodes {sorted(missing_names)} were not found.")
+
+        if not_host_names:
             raise ValueError(
                 "Function can_remove_host_node is working only for node type host."
             )
 
-        # Finds matching ancestors for host node.
-        ancestors_map = defaultdict(list)
+        # Finds matching ancestors for host node and sums the space of their
+        # descendents as (<kb_used>, <kb_avail>, <descendents>).
+        ancestors_map: Dict[NodeInfo, Tuple[int, int, List[NodeInfo]]] = {}
         for name in names:
-            # NOTE (rgildein): `self.get_node` could raise an error here, but the
-            # check runner catches all exceptions.
             descendent = self.get_node(name)
             ancestor = self.find_ancestor(descendent, required_ancestor_type)
+
             logger.debug("found ancestor `%s` for host node `%s`", ancestor, descendent)
             if ancestor is None:
                 raise ValueError(
                     f"An ancestor for the host node {descendent} could not be found."
                 )
 
-            ancestors_map[ancestor].append(descendent)
+            kb_used, kb_avail, descendents = ancestors_map.get(ancestor, (0, 0, []))
+            descendents.append(descendent)
+            ancestors_map[ancestor] = (
+                kb_used + descendent.kb_used,
+                kb_avail + descendent.kb_avail,
+                descendents,
+            )
 
         # Check if all children could be removed from parent.
-        for ancestor, descendents in ancestors_map.items():
+        for ancestor, (
+            total_descendent_kb_used,
+            total_descendent_kb_avail,
+            descendents,
+        ) in ancestors_map.items():
             # NOTE (rgildein): This will check that the ancestor will have enough space
             # even if the descendent are removed. An example with attempt to remove 2
             # descendents:
@@ -260,12 +340,6 @@ class CephTree:
             #   total available space after removing 2 units: 1 000kB - 2x200kB
             #   the total space that must moved to other units: 2x400kB
             #   check failed, due 600kB <= 800kB
-            total_descendent_kb_used = sum(
-                descendent.kb_used for descendent in descendents
-            )
-            total_descendent_kb_avail = sum(
-                descendent.kb_avail for descendent in descendents
-            )
             if (
                 ancestor.kb_avail - total_descendent_kb_avail
             ) <= total_descendent_kb_used:
@@ -293,7 +367,7 @@ class CephCommon(BaseVerifier):  # pylint: disable=W0223
         """
         verify_charm_unit("ceph-mon", *units)
         result = Result()
-        action_map = run_action_on_units(list(units), "get-health")
+        action_map = run_action_on_units(units, "get-health")
 
         for unit, action in action_map.items():
             cluster_health = data_from_action(action, "message")
@@ -338,7 +412,7 @@ class CephCommon(BaseVerifier):  # pylint: disable=W0223
         crush_rule_dump = data_from_action(action, "Stdout")
         # NOTE (rgildein): Need to remove `\n` character. This is from unit, so using
         # os.linesep does not make sense.
-        crush_rules_json: List[Dict[str, Any]] = json.loads(
+        crush_rules_json: List[Dict[str, Any]] = json_loads(
             crush_rule_dump.replace("\n", "")
         )
         crush_rules = {}
@@ -363,67 +437,96 @@ class CephCommon(BaseVerifier):  # pylint: disable=W0223
     def get_ceph_pools(cls, unit: Unit) -> List[PoolInfo]:
         """Get detail about Ceph pools (name, type, min_size, replicated).
 
+        For more info, see docstring for 'get_ceph_pools_bulk'.
+        """
+        return cls.get_ceph_pools_bulk([unit])[unit.entity_id]
+
+    @classmethod
+    def get_ceph_pools_bulk(cls, units: List[Unit]) -> Dict[str, List[PoolInfo]]:
+        """Get detail about Ceph pools (name, type, min_size, replicated).
+
         This function runs the `list-pools` action with the parameter 'format=json'
-        to gather information about all pools.
+        at once on all units to gather information about all pools.
         Pool types:
         1 - replicated crush rule type is required to know how the data is replicated
         2 - erasure (not supported yet)
         3 - erasure-coded (not supported yet)
 
+        :returns: Dict in format {unit_id: pools}
         :raises CharmException: if the unit does not belong to the ceph-mon charm
         :raises TypeError: if the object pools is not iterable
         :raises KeyError: if the key could not be obtained from the pool detail
         :raises VerificationError: if any pool is in not supported type
-        :raises json.decoder.JSONDecodeError: if json.loads failed
+        :raises ValueError: if the action output is not a valid JSON
         """
-        verify_charm_unit("ceph-mon", unit)
-        action = run_action_on_unit(unit, "list-pools", params={"format": "json"})
-        action_output = data_from_action(action, "message", "[]")
-        logger.debug("parse information about pools: %s", action_output)
-        pools: List[Dict[str, Any]] = json.loads(action_output)
-
-        # get all crush rules in Ceph cluster
-        crush_rules = cls.get_crush_rules(unit)
-        logger.debug("found %d crush rules in Ceph cluster", len(crush_rules))
-        return [
-            PoolInfo(
-                id=pool["pool"],
-                name=pool["pool_name"],
-                type=pool["type"],
-                size=pool["size"],
-                min_size=pool["min_size"],
-                crush_rule=crush_rules[pool["crush_rule"]],
-                erasure_code_profile=pool["erasure_code_profile"],
-            )
-            for pool in pools
-        ]
+        verify_charm_unit("ceph-mon", *units)
+        units_map = {unit.entity_id: unit for unit in units}
+        action_map = run_action_on_units(units, "list-pools", params={"format": "json"})
+        pools_map = {}
+        for unit_id, action in action_map.items():
+            action_output = data_from_action(action, "message", "[]")
+            logger.debug("parse information about pools: %s", action_output)
+            pools: List[Dict[str, Any]] = json_loads(action_output)
+
+            # get all crush rules in Ceph cluster
+            crush_rules = cls.get_crush_rules(units_map[unit_id])
+            logger.debug("found %d crush rules in Ceph cluster", len(crush_rules))
+            pools_map[unit_id] = [
+                PoolInfo(
+                    id=pool["pool"],
+                    name=pool["pool_name"],
+                    type=pool["type"],
+                    size=pool["size"],
+                    min_size=pool["min_size"],
+                    crush_rule=crush_rules[pool["crush_rule"]],
+                    erasure_code_profile=pool["erasure_code_profile"],
+                )
+                for pool in pools
+            ]
+
+        return pools_map
 
     @classmethod
     def get_disk_utilization(cls, unit: Unit) -> List[NodeInfo]:
         """Get disk utilization as osd tree output."""
-        verify_charm_unit("ceph-mon", unit)
+        return cls.get_disk_utilization_bulk([unit])[unit.entity_id]
+
+    @classmethod
+    def get_disk_utilization_bulk(cls, units: List[Unit]) -> Dict[str, List[NodeInfo]]:
+        """Get disk utilization as osd tree output from multiple units at once.
+
+        :returns: Dict in format {unit_id: nodes}
+        """
+        verify_charm_unit("ceph-mon", *units)
         # NOTE (rgildein): The `show-disk-free` action will provide output w/ 3 keys,
         # while this function uses only one, namely `nodes`.
         # https://github.com/openstack/charm-ceph-mon#actions
-        action = run_action_on_unit(unit, "show-disk-free", params={"format": "json"})
-        action_output = data_from_action(action, "message", "{}")
-        # NOTE (rgildein): The returned output is supported since Ceph v10.2.11 onwards.
-        logger.debug("parse information about disk utilization: %s", action_output)
-        osd_tree: Dict[str, Any] = json.loads(action_output)
-        return [
-            NodeInfo(
-                id=node["id"],
-                name=node["name"],
-                type=node["type"],
-                type_id=node["type_id"],
-                kb=node["kb"],
-                kb_used=node["kb_used"],
-                kb_avail=node["kb_avail"],
-                children=node.get("children"),
-                device_class=node.get("device_class"),
-            )
-            for node in osd_tree["nodes"]
-        ]
+        action_map = run_action_on_units(
+            units, "show-disk-free", params={"format": "json"}
+        )
+        nodes_map = {}
+        for unit_id, action in action_map.items():
+            action_output = data_from_action(action, "message", "{}")
+            # NOTE (rgildein): The returned output is supported since Ceph v10.2.11
+            # onwards.
+            logger.debug("parse information about disk utilization: %s", action_output)
+            osd_tree: Dict[str, Any] = json_loads(action_output)
+            nodes_map[unit_id] = [
+                NodeInfo(
+                    id=node["id"],
+                    name=node["name"],
+                    type=node["type"],
+                    type_id=node["type_id"],
+                    kb=node["kb"],
+                    kb_used=node["kb_used"],
+                    kb_avail=node["kb_avail"],
+                    children=node.get("children"),
+                    device_class=node.get("device_class"),
+                )
+                for node in osd_tree["nodes"]
+            ]
+
+        return nodes_map
 
 
 class CephOsd(CephCommon):
@@ -442,6 +545,7 @@ class CephOsd(CephCommon):
         self._ceph_mon_app_map: Optional[Dict[str, Unit]] = None
         self._ceph_tree_map: Optional[Dict[str, CephTree]] = None
         self._units_device_class_map: Optional[Dict[str, Dict[str, Set[Unit]]]] = None
+        self._units_by_app: Optional[Dict[str, List[Unit]]] = None
 
     @property
     def ceph_mon_app_map(self) -> Dict[str, Unit]:
@@ -453,23 +557,48 @@ class CephOsd(CephCommon):
         """
         if self._ceph_mon_app_map is None:
             self._ceph_mon_app_map = self._get_ceph_mon_app_map()
+            if not self._ceph_mon_app_map:
+                logger.warning(
+                    "the relation map between ceph-osd and ceph-mon is empty"
+                )
 
-        if not self._ceph_mon_app_map:
-            logger.warning("the relation map between ceph-osd and ceph-mon is empty")
+            logger.debug("found ceph-mon application map: %s", self._ceph_mon_app_map)
 
-        logger.debug("found ceph-mon application map: %s", self._ceph_mon_app_map)
         return self._ceph_mon_app_map
 
+    @property
+    def units_by_app(self) -> Dict[str, List[Unit]]:
+        """Get a map between ceph-osd applications and their verified units."""
+        if self._units_by_app is None:
+            self._units_by_app = {}
+            for unit in self.units:
+                self._units_by_app.setdefault(unit.application, []).append(unit)
+
+        return self._units_by_app
+
+    @property
+    def unique_ceph_mon_units(self) -> List[Unit]:
+        """Get unique ceph-mon units from ceph_mon_app_map.
+
+        Multiple ceph-osd applications could be related to the same ceph-mon unit,
+        so the units are deduplicated by their entity_id.
+        """
+        unique_units: Dict[str, Unit] = {}
+        for unit in self.ceph_mon_app_map.values():
+            unique_units.setdefault(unit.entity_id, unit)
+
+        return list(unique_units.values())
+
     @property
     def ceph_tree_map(self) -> Dict[str, CephTree]:
         """Get a map between ceph-osd application and the Ceph tree."""
         if self._ceph_tree_map is None:
             self._ceph_tree_map = self._get_ceph_tree_map()
+            if not self._ceph_tree_map:
+                logger.warning("could not get Ceph tree map")
 
-        if not self._ceph_tree_map:
-            logger.warning("could not get Ceph tree map")
+            logger.debug("found ceph tree map: %s", self._ceph_tree_map)
 
-        logger.debug("found ceph tree map: %s", str(self._ceph_tree_map))
         return self._ceph_tree_map
 
     @property
@@ -480,13 +609,13 @@ class CephOsd(CephCommon):
         """
         if self._units_device_class_map is None:
             self._units_device_class_map = self._get_units_device_class_map()
+            if not self._units_device_class_map:
+                logger.warning("could not get units device class map")
 
-        if not self._units_device_class_map:
-            logger.warning("could not get units device class map")
+            logger.debug(
+                "found units device class map: %s", self._units_device_class_map
+            )
 
-        logger.debug(
-            "found units device class map: %s", str(self._units_device_class_map)
-        )
         return self._units_device_class_map
 
     @property
@@ -538,8 +667,9 @@ class CephOsd(CephCommon):
 
     def _get_ceph_tree_map(self) -> Dict[str, CephTree]:
         """Get Ceph tree for each ceph-osd application."""
+        nodes_map = self.get_disk_utilization_bulk(self.unique_ceph_mon_units)
         return {
-            app_name: CephTree(nodes=self.get_disk_utilization(ceph_mon_unit))
+            app_name: CephTree(nodes=nodes_map[ceph_mon_unit.entity_id])
             for app_name, ceph_mon_unit in self.ceph_mon_app_map.items()
         }
 
@@ -575,7 +705,7 @@ class CephOsd(CephCommon):
         The first unit of ceph-mon will be obtained from this relation.
         :returns: Map between verified and ceph-mon units
         """
-        applications = {unit.application for unit in self.units}
+        applications = self.units_by_app.keys()
         logger.debug("affected applications %s", ", ".join(applications))
         return {name: self._get_ceph_mon_unit(name) for name in applications}
 
@@ -639,9 +769,8 @@ class CephOsd(CephCommon):
 
     def check_ceph_pools(self) -> Result:
         """Check whether Ceph cluster pools meet the requirements."""
-        for ceph_mon_unit in self.ceph_mon_app_map.values():
-            pools = self.get_ceph_pools(ceph_mon_unit)
-
+        pools_map = self.get_ceph_pools_bulk(self.unique_ceph_mon_units)
+        for pools in pools_map.values():
             # 1: replicated,
             # 2: erasure (not supported yet)
             # 3: erasure-coded (not supported yet)
@@ -662,18 +791,16 @@ class CephOsd(CephCommon):
 
     def check_ceph_cluster_health(self) -> Result:
         """Check Ceph cluster health for unique ceph-mon units from ceph_mon_app_map."""
-        unique_ceph_mon_units = {
-            unit.entity_id: unit for unit in self.ceph_mon_app_map.values()
-        }
-        return self.check_cluster_health(*unique_ceph_mon_units.values())
+        return self.check_cluster_health(*self.unique_ceph_mon_units)
 
     def check_replication_number(self) -> Result:
         """Check the minimum number of replications for related applications."""
         result = Result()
+        pools_map = self.get_ceph_pools_bulk(self.unique_ceph_mon_units)
 
         for app_name, ceph_mon_unit in self.ceph_mon_app_map.items():
             ceph_tree = self.ceph_tree_map[app_name]
-            for pool in self.get_ceph_pools(ceph_mon_unit):
+            for pool in pools_map[ceph_mon_unit.entity_id]:
                 # get all units that contain OSD with the same device class as the pool
                 units = self._get_units_by_device_class(app_name, pool)
                 # count failure_domains
@@ -688,9 +815,7 @@ class CephOsd(CephCommon):
 
                 if count_remaining_failure_domains < pool.min_size:
                     affected_units = {
-                        unit.entity_id
-                        for unit in self.units
-                        if unit.application == app_name
+                        unit.entity_id for unit in self.units_by_app.get(app_name, [])
                     }
                     result.add_partial_result(
                         Severity.FAIL,
@@ -711,8 +836,7 @@ class CephOsd(CephCommon):
         for ceph_osd_app, ceph_tree in self.ceph_tree_map.items():
             units = {
                 unit.entity_id: unit.machine.hostname
-                for unit in self.units
-                if unit.application == ceph_osd_app
+                for unit in self.units_by_app.get(ceph_osd_app, [])
             }
 
             if not ceph_tree.can_remove_host_node(
@@ -755,17 +879,17 @@ class CephMon(CephCommon):
 
         This function will gain *mon_count* and *online_mons* from the action output.
         """
-        quorum_status = json.loads(data_from_action(action, "message"))
+        quorum_status = json_loads(data_from_action(action, "message"))
         know_mons = set(mon["name"] for mon in quorum_status["monmap"]["mons"])
         online_mons = set(quorum_status["quorum_names"])
         return len(know_mons), online_mons
 
     def check_ceph_cluster_health(self) -> Result:
         """Check Ceph cluster health for unique ceph-mon application."""
-        # Get one ceph-mon unit per each application
+        # Get one ceph-mon unit per each application. A unit belongs to exactly one
+        # application, so the units in this map are already unique.
         app_map = {unit.application: unit for unit in self.units}
-        unique_units = {unit.entity_id: unit for unit in app_map.values()}
-        return self.check_cluster_health(*unique_units.values())
+        return self.check_cluster_health(*app_map.values())
 
     def check_quorum(self) -> Result:
         """Check that the shutdown does not result in <50% mons alive."""
@@ -788,7 +912,7 @@ class CephMon(CephCommon):
                         f"ceph-mon quorum",
                     )
 
-            except (json.decoder.JSONDecodeError, KeyError) as error:
+            except (ValueError, KeyError) as error:
                 logger.error(
                     "Failed to parse quorum status from Action %s. error: %s",
                     action.entity_id,
@@ -349,7 +349,7 @@ def test_main_expected_failure(mocker, error, error_msg):
     mocker.patch.object(cli, "asyncio")
     mocker.patch.object(cli, "connect_model", new_callable=MagicMock())
     mocker.patch.object(cli, "find_units", new_callable=MagicMock())
-    mocker.patch.object(cli, "get_verifiers").side_effect = [error(error_msg)]
+    mocker.patch.object(cli, "get_verifiers").side_effect = error(error_msg)
     mock_logger = mocker.patch.object(cli, "logger")
 
     with pytest.raises(SystemExit):
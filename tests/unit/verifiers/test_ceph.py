@@ -115,6 +115,14 @@ TEST_NODES_OUTPUT = [
 ]
 
 
+@pytest.fixture(params=["json", "orjson"])
+def json_parser(request, mocker):
+    """Parse the action outputs with both the default json parser and orjson."""
+    parser = pytest.importorskip(request.param)
+    mocker.patch("juju_verify.verifiers.ceph.json_loads", parser.loads)
+    return parser.loads
+
+
 def test_node_info():
     """Test initialization of NodeInfo and comparison."""
     node = {
@@ -131,7 +139,8 @@ def test_node_info():
     assert node_info.id == 10
     assert node_info == NodeInfo(**node)
     assert str(node_info) == "0-osd.0(10)"
-    assert hash(node_info) == hash("0-osd.0(10)")
+    assert hash(node_info) == hash((0, "osd.0", 10))
+    assert hash(node_info) == hash(NodeInfo(**node))
 
 
 def test_ceph_tree_method():
@@ -155,11 +164,6 @@ def test_ceph_tree_method():
     with pytest.raises(KeyError):
         tree.get_node("not-valid-child-name")
 
-    with pytest.raises(ValueError):
-        test_tree = CephTree(nodes)
-        test_tree._nodes = nodes[1:]  # change private value
-        test_tree.get_node("default")  # trying to get root node by name
-
     with pytest.raises(KeyError):
         tree.can_remove_host_node("not-valid-child-name")
 
@@ -177,6 +181,23 @@ def test_ceph_tree_method():
         tree.can_remove_host_node("unit.0", required_ancestor_type="not-valid-rule")
 
 
+def test_ceph_tree_str_hash_cache():
+    """Test that the string representation and hash of CephTree are cached."""
+    tree = CephTree(nodes=[NodeInfo(**node) for node in TEST_NODES_OUTPUT])
+    assert tree._str is None and tree._hash is None
+
+    with mock.patch(
+        "juju_verify.verifiers.ceph.sorted", wraps=sorted, create=True
+    ) as mock_sorted:
+        tree_str = str(tree)
+        assert tree._str is tree_str
+        assert str(tree) is tree_str
+        assert hash(tree) == hash(tree_str)
+        assert tree._hash == hash(tree_str)
+        assert hash(tree) == tree._hash
+        mock_sorted.assert_called_once()
+
+
 @pytest.mark.parametrize(
     "exp_child, exp_parent, ancestor_type, can_remove_host_node",
     [
@@ -204,6 +225,39 @@ def test_ceph_tree(exp_child, exp_parent, ancestor_type, can_remove_host_node):
     )
 
 
+def test_ceph_tree_ancestors_map():
+    """Test that the nearest ancestors of each type are precomputed for all nodes."""
+    nodes = [NodeInfo(**node) for node in TEST_NODES_OUTPUT]
+    tree = CephTree(nodes=nodes)
+    root, rack_1, unit_0 = (
+        tree.get_node(name) for name in ["default", "rack.1", "unit.0"]
+    )
+
+    assert tree._ancestors_map[root.id] == {}
+    assert tree._ancestors_map[rack_1.id] == {"root": root}
+    assert tree._ancestors_map[unit_0.id] == {"root": root, "rack": rack_1}
+    # nodes without ancestor of required type
+    assert tree.find_ancestor(unit_0, "datacenter") is None
+    assert tree.find_ancestor(root, "root") is None
+    # unknown node
+    unknown = NodeInfo(**{**TEST_NODES_OUTPUT[2], "id": 99, "name": "unknown"})
+    assert tree.find_ancestor(unknown, "root") is None
+
+
+def test_ceph_tree_host_without_root():
+    """Test that a host, which is not connected to any root, could not be removed."""
+    nodes = [NodeInfo(**node) for node in TEST_NODES_OUTPUT]
+
+    # tree with two roots
+    tree = CephTree(nodes=[*nodes, NodeInfo(-4, "ssd", 10, "root", 0, 0, 0, [])])
+    assert tree.can_remove_host_node("unit.1") is True
+
+    # tree with host, which is not connected to the root
+    tree = CephTree(nodes=[*nodes, NodeInfo(4, "unit.4", 1, "host", 0, 0, 0)])
+    with pytest.raises(ValueError):
+        tree.can_remove_host_node("unit.4")
+
+
 @mock.patch("juju_verify.verifiers.ceph.run_action_on_units")
 @pytest.mark.parametrize(
     "message, exp_result",
@@ -294,17 +348,25 @@ def test_check_cluster_health_error(model):
 
 
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
-@mock.patch("juju_verify.verifiers.ceph.CephOsd.get_disk_utilization")
-def test_get_ceph_tree_map(mock_get_disk_utilization, mock_ceph_mon_app_map, model):
+@mock.patch("juju_verify.verifiers.ceph.CephOsd.get_disk_utilization_bulk")
+def test_get_ceph_tree_map(
+    mock_get_disk_utilization_bulk, mock_ceph_mon_app_map, model
+):
     """Test get Ceph tree for each ceph-osd application."""
-    mock_ceph_mon_app_map.return_value = {"ceph-osd": model.units["ceph-mon/0"]}
+    mock_ceph_mon_app_map.return_value = {
+        "ceph-osd": model.units["ceph-mon/0"],
+        "ceph-osd-hdd": model.units["ceph-mon/0"],
+    }
     nodes = [NodeInfo(-1, "default", 0, "root", 0, 0, 0, [])]
-    mock_get_disk_utilization.return_value = nodes
+    mock_get_disk_utilization_bulk.return_value = {"ceph-mon/0": nodes}
 
     ceph_tree_map = CephOsd([model.units["ceph-osd/0"]])._get_ceph_tree_map()
 
-    assert ceph_tree_map == {"ceph-osd": CephTree(nodes)}
-    mock_get_disk_utilization.assert_called_once_with(model.units["ceph-mon/0"])
+    assert ceph_tree_map == {
+        "ceph-osd": CephTree(nodes),
+        "ceph-osd-hdd": CephTree(nodes),
+    }
+    mock_get_disk_utilization_bulk.assert_called_once_with([model.units["ceph-mon/0"]])
 
 
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_tree_map")
@@ -452,8 +514,8 @@ def test_get_crush_rules(mock_run_command_on_unit, model):
 
 
 @mock.patch("juju_verify.verifiers.ceph.CephCommon.get_crush_rules")
-@mock.patch("juju_verify.verifiers.ceph.run_action_on_unit")
-def test_get_ceph_pools(mock_run_action_on_unit, mock_get_crush_rules, model):
+@mock.patch("juju_verify.verifiers.ceph.run_action_on_units")
+def test_get_ceph_pools(mock_run_action_on_units, mock_get_crush_rules, model):
     """Test get detail about Ceph pools."""
     action = MagicMock()
     action.data.get.side_effect = {
@@ -482,7 +544,7 @@ def test_get_ceph_pools(mock_run_action_on_unit, mock_get_crush_rules, model):
             )
         }
     }.get
-    mock_run_action_on_unit.return_value = action
+    mock_run_action_on_units.return_value = {"ceph-mon/0": action}
     mock_get_crush_rules.return_value = {2: CrushRuleInfo(2, "test", "host")}
 
     pools = CephCommon.get_ceph_pools(model.units["ceph-mon/0"])
@@ -494,8 +556,8 @@ def test_get_ceph_pools(mock_run_action_on_unit, mock_get_crush_rules, model):
     assert pools[1].id == 3
 
 
-@mock.patch("juju_verify.verifiers.ceph.run_action_on_unit")
-def test_get_disk_utilization(mock_run_action_on_unit, model):
+@mock.patch("juju_verify.verifiers.ceph.run_action_on_units")
+def test_get_disk_utilization(mock_run_action_on_units, model):
     """Test get disk utilization for ceph."""
     action = MagicMock()
     action.data.get.side_effect = {
@@ -576,9 +638,12 @@ def test_get_disk_utilization(mock_run_action_on_unit, model):
             )
         }
     }.get
-    mock_run_action_on_unit.return_value = action
+    mock_run_action_on_units.return_value = {"ceph-mon/0": action}
 
     nodes = CephCommon.get_disk_utilization(model.units["ceph-mon/0"])
+    mock_run_action_on_units.assert_called_once_with(
+        [model.units["ceph-mon/0"]], "show-disk-free", params={"format": "json"}
+    )
     assert any(
         node.name == "juju-2ecfef-zaza-a0e73f67a6c0-1" and node.children == [0]
         for node in nodes
@@ -586,6 +651,81 @@ def test_get_disk_utilization(mock_run_action_on_unit, model):
     assert any(node.name == "osd.0" and node.id == 0 for node in nodes)
 
 
+@pytest.mark.usefixtures("json_parser")
+@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_crush_rules")
+@mock.patch("juju_verify.verifiers.ceph.run_action_on_units")
+def test_get_ceph_pools_bulk(mock_run_action_on_units, mock_get_crush_rules, model):
+    """Test get detail about Ceph pools from multiple ceph-mon units at once."""
+    units = [model.units["ceph-mon/0"], model.units["ceph-mon/1"]]
+    action_map = {}
+    for unit_index, unit in enumerate(units):
+        pool = {
+            "pool": unit_index,
+            "pool_name": f"pool-{unit_index}",
+            "type": 1,
+            "size": 3,
+            "min_size": 2,
+            "crush_rule": unit_index,
+            "erasure_code_profile": "",
+        }
+        action = MagicMock()
+        action.data.get.side_effect = {"results": {"message": json.dumps([pool])}}.get
+        action_map[unit.entity_id] = action
+
+    mock_run_action_on_units.return_value = action_map
+    crush_rules = {
+        "ceph-mon/0": {0: CrushRuleInfo(0, "rule-0", "host")},
+        "ceph-mon/1": {1: CrushRuleInfo(1, "rule-1", "rack")},
+    }
+    mock_get_crush_rules.side_effect = lambda unit: crush_rules[unit.entity_id]
+
+    pools_map = CephCommon.get_ceph_pools_bulk(units)
+
+    mock_run_action_on_units.assert_called_once_with(
+        units, "list-pools", params={"format": "json"}
+    )
+    assert mock_get_crush_rules.call_args_list == [mock.call(unit) for unit in units]
+    assert [pool.name for pool in pools_map["ceph-mon/0"]] == ["pool-0"]
+    assert pools_map["ceph-mon/0"][0].crush_rule.name == "rule-0"
+    assert [pool.name for pool in pools_map["ceph-mon/1"]] == ["pool-1"]
+    assert pools_map["ceph-mon/1"][0].crush_rule.name == "rule-1"
+
+
+@pytest.mark.usefixtures("json_parser")
+@mock.patch("juju_verify.verifiers.ceph.run_action_on_units")
+def test_get_disk_utilization_bulk(mock_run_action_on_units, model):
+    """Test get disk utilization from multiple ceph-mon units at once."""
+    units = [model.units["ceph-mon/0"], model.units["ceph-mon/1"]]
+    action_map = {}
+    for unit_index, unit in enumerate(units):
+        node = {
+            "id": -1,
+            "name": f"root-{unit_index}",
+            "type": "root",
+            "type_id": 10,
+            "kb": 100,
+            "kb_used": 10 * unit_index,
+            "kb_avail": 100 - 10 * unit_index,
+        }
+        action = MagicMock()
+        action.data.get.side_effect = {
+            "results": {"message": json.dumps({"nodes": [node]})}
+        }.get
+        action_map[unit.entity_id] = action
+
+    mock_run_action_on_units.return_value = action_map
+
+    nodes_map = CephCommon.get_disk_utilization_bulk(units)
+
+    mock_run_action_on_units.assert_called_once_with(
+        units, "show-disk-free", params={"format": "json"}
+    )
+    assert nodes_map == {
+        "ceph-mon/0": [NodeInfo(-1, "root-0", 10, "root", 100, 0, 100)],
+        "ceph-mon/1": [NodeInfo(-1, "root-1", 10, "root", 100, 10, 90)],
+    }
+
+
 def test_get_ceph_mon_unit(model):
     """Test get ceph-mon unit related to application."""
     ceph_mon_units = [
@@ -643,6 +783,20 @@ def test_get_ceph_mon_app_map(mock_get_ceph_mon_unit, model):
     }
 
 
+def test_units_by_app(model):
+    """Test grouping of verified units by their application."""
+    ceph_osd_units = [
+        model.units["ceph-osd/0"],
+        model.units["ceph-osd-hdd/0"],
+        model.units["ceph-osd/1"],
+    ]
+
+    assert CephOsd(ceph_osd_units).units_by_app == {
+        "ceph-osd": [model.units["ceph-osd/0"], model.units["ceph-osd/1"]],
+        "ceph-osd-hdd": [model.units["ceph-osd-hdd/0"]],
+    }
+
+
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_units_device_class_map")
 def test_get_units_by_device_class(mock_get_units_device_class_map, model):
     """Test function to get all units contain OSD with same device class as pool."""
@@ -713,6 +867,22 @@ def test_get_units_by_device_class(mock_get_units_device_class_map, model):
     }
 
 
+@mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
+def test_unique_ceph_mon_units(mock_get_ceph_mon_app_map, model):
+    """Test getting unique ceph-mon units related to verified units."""
+    mock_get_ceph_mon_app_map.return_value = {
+        "ceph-osd": model.units["ceph-mon/0"],
+        "ceph-osd-hdd": model.units["ceph-mon/1"],
+        "ceph-osd-ssd": model.units["ceph-mon/0"],
+    }
+
+    ceph_osd_verifier = CephOsd([model.units["ceph-osd/0"]])
+    assert ceph_osd_verifier.unique_ceph_mon_units == [
+        model.units["ceph-mon/0"],
+        model.units["ceph-mon/1"],
+    ]
+
+
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
 @mock.patch("juju_verify.verifiers.ceph.CephCommon.check_cluster_health")
 def test_check_ceph_cluster_health(
@@ -728,13 +898,13 @@ def test_check_ceph_cluster_health(
     mock_check_cluster_health.assert_called_once_with(model.units["ceph-mon/0"])
 
 
-@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_ceph_pools")
+@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_ceph_pools_bulk")
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
-def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools, model):
+def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools_bulk, model):
     """Test check whether Ceph cluster pools meet the requirements."""
     mock_get_ceph_mon_app_map.return_value = {"ceph-osd": model.units["ceph-mon/0"]}
     # check Ceph cluster w/ no pools
-    mock_get_ceph_pools.return_value = []
+    mock_get_ceph_pools_bulk.return_value = {"ceph-mon/0": []}
 
     result = CephOsd([model.units["ceph-osd/0"]]).check_ceph_pools()
     assert result == Result(Severity.OK, "The requirements for ceph check were met.")
@@ -742,10 +912,12 @@ def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools, model):
     # check Ceph cluster w/ two pools of the same type and two similar crush rules
     slow_crush_rule = CrushRuleInfo(0, "slow", "host", "hdd")
     fast_crush_rule = CrushRuleInfo(1, "fast", "host", "ssd")
-    mock_get_ceph_pools.return_value = [
-        PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
-        PoolInfo(1, "pool-1", 1, 3, 2, fast_crush_rule, ""),
-    ]
+    mock_get_ceph_pools_bulk.return_value = {
+        "ceph-mon/0": [
+            PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
+            PoolInfo(1, "pool-1", 1, 3, 2, fast_crush_rule, ""),
+        ]
+    }
 
     result = CephOsd([model.units["ceph-osd/0"]]).check_ceph_pools()
     assert result == Result(Severity.OK, "The requirements for ceph check were met.")
@@ -753,10 +925,12 @@ def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools, model):
     # check Ceph cluster w/ two pools of the same type and two different crush rules
     slow_crush_rule = CrushRuleInfo(0, "slow", "rac", "hdd")
     fast_crush_rule = CrushRuleInfo(1, "fast", "host", "ssd")
-    mock_get_ceph_pools.return_value = [
-        PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
-        PoolInfo(1, "pool-1", 1, 3, 2, fast_crush_rule, ""),
-    ]
+    mock_get_ceph_pools_bulk.return_value = {
+        "ceph-mon/0": [
+            PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
+            PoolInfo(1, "pool-1", 1, 3, 2, fast_crush_rule, ""),
+        ]
+    }
     result = CephOsd([model.units["ceph-osd/0"]]).check_ceph_pools()
     assert result == Result(
         Severity.FAIL,
@@ -766,10 +940,14 @@ def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools, model):
     # check Ceph cluster w/ two pools of the different type and two similar crush rules
     slow_crush_rule = CrushRuleInfo(0, "slow", "host", "hdd")
     fast_crush_rule = CrushRuleInfo(1, "fast", "host", "ssd")
-    mock_get_ceph_pools.return_value = [
-        PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
-        PoolInfo(1, "pool-1", 2, 3, 2, fast_crush_rule, "test-erasure_code_profile"),
-    ]
+    mock_get_ceph_pools_bulk.return_value = {
+        "ceph-mon/0": [
+            PoolInfo(0, "pool-0", 1, 3, 2, slow_crush_rule, ""),
+            PoolInfo(
+                1, "pool-1", 2, 3, 2, fast_crush_rule, "test-erasure_code_profile"
+            ),
+        ]
+    }
 
     result = CephOsd([model.units["ceph-osd/0"]]).check_ceph_pools()
     assert result == Result(
@@ -779,13 +957,13 @@ def test_check_ceph_pool(mock_get_ceph_mon_app_map, mock_get_ceph_pools, model):
 
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._count_branch")
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_units_by_device_class")
-@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_ceph_pools")
+@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_ceph_pools_bulk")
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_tree_map")
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
 def test_check_replication_number(
     mock_get_ceph_mon_app_map,
     mock_get_ceph_tree_map,
-    mock_get_ceph_pools,
+    mock_get_ceph_pools_bulk,
     mock_get_units_by_device_class,
     mock_count_branch,
     model,
@@ -794,7 +972,7 @@ def test_check_replication_number(
     mock_get_ceph_mon_app_map.return_value = {"ceph-osd": model.units["ceph-mon/0"]}
     mock_ceph_tree = MagicMock()
     mock_get_ceph_tree_map.return_value = {"ceph-osd": mock_ceph_tree}
-    mock_get_ceph_pools.return_value = []
+    mock_get_ceph_pools_bulk.return_value = {"ceph-mon/0": []}
     mock_get_units_by_device_class.return_value = {
         model.units["ceph-osd/0"],
         model.units["ceph-osd/1"],
@@ -805,15 +983,15 @@ def test_check_replication_number(
     result = CephOsd([model.units["ceph-osd/0"]]).check_replication_number()
     mock_get_ceph_mon_app_map.assert_called_once()
     mock_get_ceph_tree_map.assert_called_once()
-    mock_get_ceph_pools.assert_called_once()
+    mock_get_ceph_pools_bulk.assert_called_once()
     mock_get_units_by_device_class.assert_not_called()
     assert result == Result(Severity.OK, "Minimum replica number check passed.")
 
     # check one ceph-osd unit on Ceph cluster w/ one pool without device_class
     host_crush_rule = CrushRuleInfo(0, "slow", "host", None)
-    mock_get_ceph_pools.return_value = [
-        PoolInfo(1, "pool-1", 1, 3, 2, host_crush_rule, "")
-    ]
+    mock_get_ceph_pools_bulk.return_value = {
+        "ceph-mon/0": [PoolInfo(1, "pool-1", 1, 3, 2, host_crush_rule, "")]
+    }
     mock_count_branch.return_value = 2
 
     result = CephOsd([model.units["ceph-osd/0"]]).check_replication_number()
@@ -822,9 +1000,9 @@ def test_check_replication_number(
 
     # check one ceph-osd unit on Ceph cluster w/ one pool w/ device_class == hdd
     host_crush_rule = CrushRuleInfo(0, "slow", "host", "hdd")
-    mock_get_ceph_pools.return_value = [
-        PoolInfo(1, "pool-1", 1, 3, 2, host_crush_rule, "")
-    ]
+    mock_get_ceph_pools_bulk.return_value = {
+        "ceph-mon/0": [PoolInfo(1, "pool-1", 1, 3, 2, host_crush_rule, "")]
+    }
     mock_count_branch.return_value = 2
 
     result = CephOsd([model.units["ceph-osd/0"]]).check_replication_number()
@@ -846,14 +1024,14 @@ def test_check_replication_number(
 
 
 @mock.patch("juju_verify.verifiers.ceph.CephOsd._get_ceph_mon_app_map")
-@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_disk_utilization")
+@mock.patch("juju_verify.verifiers.ceph.CephCommon.get_disk_utilization_bulk")
 def test_check_availability_zone(
-    mock_get_disk_utilization, mock_get_ceph_mon_app_map, model
+    mock_get_disk_utilization_bulk, mock_get_ceph_mon_app_map, model
 ):
     """Test check removing unit from availability zone."""
-    mock_get_disk_utilization.return_value = [
-        NodeInfo(**node) for node in TEST_NODES_OUTPUT
-    ]
+    mock_get_disk_utilization_bulk.return_value = {
+        "ceph-mon/0": [NodeInfo(**node) for node in TEST_NODES_OUTPUT]
+    }
 
     # test empty ceph_mon_app_map, aka default result
     mock_get_ceph_mon_app_map.return_value = {}
@@ -1034,6 +1212,7 @@ def test_verify_shutdown(
         ),
     ],
 )
+@pytest.mark.usefixtures("json_parser")
 def test_parse_quorum_status(action_output, exp_output):
     """Test function to parse `get-quorum-status` action output."""
     mock_action = MagicMock()
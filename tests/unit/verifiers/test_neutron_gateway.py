@@ -15,25 +15,24 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see https://www.gnu.org/licenses/.
 """NeutronGateway verifier class test suite."""
+# pylint: disable=redefined-outer-name
 import json
-from copy import deepcopy
-from itertools import cycle, permutations
+from itertools import permutations
 from unittest import mock
 from unittest.mock import MagicMock
 
 import pytest
 from juju.unit import Unit
 
-from juju_verify.verifiers import NeutronGateway, Result, Severity
+from juju_verify.verifiers import NeutronGateway, Result, Severity, neutron_gateway
 
-all_ngw_units = []
-for i in range(3):
-    ngw = MagicMock()
-    machine = MagicMock()
-    machine.hostname = f"host{i}"
-    ngw.entity_id = f"neutron-gateway/{i}"
-    ngw.machine = machine
-    all_ngw_units.append(ngw)
+# only entity_id and machine.hostname are used by the verifier
+all_ngw_units = [
+    MagicMock(
+        spec=Unit, entity_id=f"neutron-gateway/{i}", **{"machine.hostname": f"host{i}"}
+    )
+    for i in range(3)
+]
 
 mock_data = [
     {
@@ -64,234 +63,199 @@ mock_data = [
     },
 ]
 
-all_ngw_host_names = [host["host"] for host in mock_data]
-
-model = MagicMock()
-
+# number of routers on all hosts, on hosts being shutdown and on hosts staying online
+router_counts = {
+    "all": sum(len(host["routers"]) for host in mock_data),
+    "shutdown": sum(len(host["routers"]) for host in mock_data if host["shutdown"]),
+    "online": sum(len(host["routers"]) for host in mock_data if not host["shutdown"]),
+}
+# map between the unit id and the host in mock data, where the unit is running
+unit_hosts = {host["unit"].entity_id: host for host in mock_data}
+# map between the router id and the host in mock data, where the router is located
+router_hosts = {router: host for host in mock_data for router in host["routers"]}
+
+# resources returned by the action and their serialized form in the action output
+router_resource = {"routers": [{"id": "r1"}]}
+router_resource_json = json.dumps(router_resource)
+
+# warning for a single HA router, which should be manually failed over
+HA_ROUTER_MESSAGE = (
+    "It's recommended that you manually failover the following routers: "
+    "{router} (on {unit}, hostname: {host})"
+)
 
-def get_ngw_verifier():
-    """Get new NeutronGateway verifier (used for applying changes in shutdown list)."""
-    units = []
-    for mock_unit in mock_data:
-        if mock_unit["shutdown"]:
-            unit = Unit(mock_unit["unit"], model)
-            machine = MagicMock()
-            machine.hostname = mock_unit["host"]
-            unit.machine = machine
-            units.append(unit)
-    return NeutronGateway(units)
 
+def get_ngw_verifier(juju_units):
+    """Get new NeutronGateway verifier (used for applying changes in shutdown list).
 
-def get_resource_lists():
-    """Get all routers in mock data."""
-    return [host["routers"] for host in mock_data]
+    :param juju_units: map between the unit id and juju unit, see `juju_ngw_units`
+    """
+    return NeutronGateway(
+        [juju_units[host["unit"].entity_id] for host in mock_data if host["shutdown"]]
+    )
 
 
-def get_shutdown_host_name_list():
-    """Get all hostnames of all hosts being shutdown."""
-    return [host["host"] for host in mock_data if host["shutdown"]]
+def get_unit_resource_list(unit, _):
+    """Get current routers of the host running the unit in mock data."""
+    return unit_hosts[unit.entity_id]["routers"]
 
 
 def set_router_status(router_id, status):
     """Set status of given router id in mock data."""
-    for host in mock_data:
-        if router_id in host["routers"]:
-            host["routers"][router_id].update({"status": status})
-
-
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.get_unit_resource_list"
-)
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.get_all_ngw_units")
-def test_get_resource_list(mock_get_all_ngw_units, mock_get_unit_resource_list):
-    """Test list of resources returned by get_resource_list."""
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
-
-    ngw_verifier = get_ngw_verifier()
-    router_list = ngw_verifier.get_resource_list("show-routers")
-
-    router_count = 0
-    for host in mock_data:
-        router_count += len(host["routers"])
-    assert len(router_list) == router_count
-
+    router_hosts[router_id]["routers"][router_id].update({"status": status})
 
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.get_unit_resource_list"
-)
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.get_all_ngw_units")
-def test_get_shutdown_resource_list(
-    mock_get_all_ngw_units, mock_get_unit_resource_list
-):
-    """Test validity of list of resources to be shutdown."""
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
 
-    ngw_verifier = get_ngw_verifier()
+@pytest.fixture(scope="module")
+def juju_ngw_units(model):
+    """Create juju units for all neutron-gateway units in mock data.
 
-    router_shutdown_count = 0
+    The units can only be created once the `model` fixture has patched the juju Unit,
+    so that their machine can be set.
+    """
+    juju_units = {}
     for host in mock_data:
-        if host["shutdown"]:
-            router_shutdown_count += len(host["routers"])
+        unit = Unit(host["unit"].entity_id, model)
+        # reuse the machine (with hostname) of the neutron-gateway unit mock
+        unit.machine = host["unit"].machine
+        juju_units[unit.entity_id] = unit
 
-    shutdown_routers = ngw_verifier.get_shutdown_resource_list("show-routers")
-    assert len(shutdown_routers) == router_shutdown_count
+    return juju_units
 
-    # test that inactive resources are not being listed as being shutdown
-    set_router_status("router0", "NOTACTIVE")
 
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
+@pytest.fixture
+def mock_ngw_resources(mocker):
+    """Mock all neutron-gateway units and the resources retrieved from them."""
+    mocker.patch.object(NeutronGateway, "get_all_ngw_units", return_value=all_ngw_units)
+    mocker.patch.object(
+        NeutronGateway, "get_unit_resource_list", side_effect=get_unit_resource_list
+    )
 
-    shutdown_routers = ngw_verifier.get_shutdown_resource_list("show-routers")
-    assert len(shutdown_routers) == router_shutdown_count - 1
 
-    # set router0 back to active
-    set_router_status("router0", "ACTIVE")
+@pytest.fixture(scope="module")
+def shared_ngw_verifier(juju_ngw_units):
+    """Get NeutronGateway verifier shared by tests, which do not modify mock data."""
+    return get_ngw_verifier(juju_ngw_units)
 
 
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.get_unit_resource_list"
+@pytest.mark.parametrize(
+    "method, router_count, inactive_router, inactive_count",
+    [
+        # all resources are listed, regardless of their status
+        ("get_resource_list", router_counts["all"], "router0", 0),
+        # inactive resources are not being listed as being shutdown
+        ("get_shutdown_resource_list", router_counts["shutdown"], "router0", 1),
+        # NOT ACTIVE resources are not being listed as online/available
+        ("get_online_resource_list", router_counts["online"], "router2", 1),
+    ],
 )
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.get_all_ngw_units")
-def test_get_online_resource_list(mock_get_all_ngw_units, mock_get_unit_resource_list):
-    """Test validity of resources that will remain online."""
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
-
-    ngw_verifier = get_ngw_verifier()
-
-    router_online_count = 0
-    for host in mock_data:
-        if not host["shutdown"]:
-            router_online_count += len(host["routers"])
-
-    online_routers = ngw_verifier.get_online_resource_list("show-routers")
-    assert len(online_routers) == router_online_count
-
-    # test that NOT ACTIVE resources are not being listed as online/available
-    set_router_status("router2", "NOTACTIVE")
-
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
+@pytest.mark.usefixtures("mock_ngw_resources")
+def test_get_resource_lists(
+    method, router_count, inactive_router, inactive_count, juju_ngw_units
+):
+    """Test list of resources returned by get_*resource_list methods."""
+    ngw_verifier = get_ngw_verifier(juju_ngw_units)
+    get_resources = getattr(ngw_verifier, method)
 
-    online_routers = ngw_verifier.get_online_resource_list("show-routers")
-    assert len(online_routers) == router_online_count - 1
+    assert len(get_resources("show-routers")) == router_count
 
-    # set router2 back to active
-    set_router_status("router2", "ACTIVE")
+    set_router_status(inactive_router, "NOTACTIVE")
+    try:
+        routers = get_resources("show-routers")
+        assert len(routers) == router_count - inactive_count
+    finally:
+        # set router back to active
+        set_router_status(inactive_router, "ACTIVE")
 
 
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.get_unit_resource_list"
-)
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.get_all_ngw_units")
-def test_check_non_redundant_resource(
-    mock_get_all_ngw_units, mock_get_unit_resource_list
-):
+@pytest.mark.usefixtures("mock_ngw_resources")
+def test_check_non_redundant_resource(juju_ngw_units):
     """Test validity of list of resources determined to not be redundant."""
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = cycle(get_resource_lists())
-
-    ngw_verifier = get_ngw_verifier()
+    ngw_verifier = get_ngw_verifier(juju_ngw_units)
 
     # host0 being shutdown, with no redundancy for its routers (router0, router1)
     result = ngw_verifier.check_non_redundant_resource("show-routers")
     assert result.success is False
 
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = cycle(get_resource_lists())
-
-    ngw_verifier = get_ngw_verifier()
-
-    # store original mock_data
-    global mock_data
-    original_mock = deepcopy(mock_data)
-    # add redundancy (but not HA) for router0, router1 onto non-shutdown hosts
-    mock_data[1]["routers"]["router0"] = {"ha": False, "status": "ACTIVE"}
-    mock_data[2]["routers"]["router1"] = {"ha": False, "status": "ACTIVE"}
-    mock_get_unit_resource_list.side_effect = cycle(get_resource_lists())
-    result = ngw_verifier.check_non_redundant_resource("show-routers")
-    assert result.success
-
-    # test setting redundant redundant router0 to NOTACTIVE will result in failure
-    mock_data[1]["routers"]["router0"].update({"status": "NOTACTIVE"})
-    mock_get_unit_resource_list.side_effect = cycle(get_resource_lists())
-    result = ngw_verifier.check_non_redundant_resource("show-routers")
-    assert result.success is False
-
-    # test shutdown host1, which will take down the redundant router0
-    mock_data[1]["shutdown"] = True
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = cycle(get_resource_lists())
+    # store original routers and shutdown flags, the only mock_data modified here
+    original_routers = [dict(host["routers"]) for host in mock_data]
+    original_shutdown = [host["shutdown"] for host in mock_data]
+    try:
+        # add redundancy (but not HA) for router0, router1 onto non-shutdown hosts
+        mock_data[1]["routers"]["router0"] = {"ha": False, "status": "ACTIVE"}
+        mock_data[2]["routers"]["router1"] = {"ha": False, "status": "ACTIVE"}
+        result = ngw_verifier.check_non_redundant_resource("show-routers")
+        assert result.success
+
+        # test setting redundant redundant router0 to NOTACTIVE will result in failure
+        mock_data[1]["routers"]["router0"].update({"status": "NOTACTIVE"})
+        result = ngw_verifier.check_non_redundant_resource("show-routers")
+        assert result.success is False
+
+        # test shutdown host1, which will take down the redundant router0
+        mock_data[1]["shutdown"] = True
+
+        ngw_verifier = get_ngw_verifier(juju_ngw_units)
+        result = ngw_verifier.check_non_redundant_resource("show-routers")
+        assert result.success is False
+    finally:
+        # restore mock_data
+        for host, routers, shutdown in zip(
+            mock_data, original_routers, original_shutdown
+        ):
+            host["routers"] = routers
+            host["shutdown"] = shutdown
 
-    ngw_verifier = get_ngw_verifier()
-    result = ngw_verifier.check_non_redundant_resource("show-routers")
-    assert result.success is False
 
-    # restore mock_data
-    mock_data = original_mock
-
-
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.get_unit_resource_list"
+@pytest.mark.parametrize(
+    "ha_router, expect_warning",
+    [
+        ("router0", True),
+        ("router1", True),
+        # HA router on the host, which is not being shutdown
+        ("router2", False),
+    ],
 )
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.get_all_ngw_units")
-def test_warn_router_ha(mock_get_all_ngw_units, mock_get_unit_resource_list):
+@pytest.mark.usefixtures("mock_ngw_resources")
+def test_warn_router_ha(ha_router, expect_warning, juju_ngw_units):
     """Test existence of warning messages to manually failover HA routers when found."""
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
-
-    ngw_verifier = get_ngw_verifier()
+    ngw_verifier = get_ngw_verifier(juju_ngw_units)
 
     result = ngw_verifier.warn_router_ha()
     # no HA to failover, lack of redundancy is detected by check_non_redundant_resource
     assert result == Result()
 
-    # Find router0 set it to HA
-    expected_router = None
-    expected_unit = None
-    expected_host = None
-    for host in mock_data:
-        if "router0" in host["routers"]:
-            host["routers"]["router0"].update({"ha": True})
-            expected_router = "router0"
-            expected_unit = host["unit"].entity_id
-            expected_host = host["host"]
-
-    mock_get_all_ngw_units.return_value = all_ngw_units
-    mock_get_unit_resource_list.side_effect = get_resource_lists()
-
-    ngw_verifier = get_ngw_verifier()
-
-    result = ngw_verifier.warn_router_ha()
+    # set router to HA
+    host = router_hosts[ha_router]
+    host["routers"][ha_router].update({"ha": True})
+    try:
+        result = ngw_verifier.warn_router_ha()
+    finally:
+        host["routers"][ha_router].update({"ha": False})
+
+    expected_result = Result()
+    if expect_warning:
+        expected_message = HA_ROUTER_MESSAGE.format(
+            router=ha_router, unit=host["unit"].entity_id, host=host["host"]
+        )
+        # router is in HA, given instructions to failover
+        expected_result = Result(Severity.WARN, expected_message)
 
-    router_format = f"{expected_router} (on {expected_unit}, hostname: {expected_host})"
-    expected_message = (
-        "It's recommended that you manually failover the following "
-        f"routers: {router_format}"
-    )
-    expected_result = Result(Severity.WARN, expected_message)
-    # router is in HA, given instructions to failover
-    assert result.partials == expected_result.partials
+    assert result == expected_result
 
 
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.version_check")
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.check_non_redundant_resource"
-)
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.warn_lbaas_present")
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.warn_router_ha")
+@mock.patch.object(NeutronGateway, "version_check")
+@mock.patch.object(NeutronGateway, "check_non_redundant_resource")
+@mock.patch.object(NeutronGateway, "warn_lbaas_present")
+@mock.patch.object(NeutronGateway, "warn_router_ha")
 def test_verify_reboot_shutdown(
     mock_warn_router_ha,
     mock_warn_lbaas_preent,
     mock_check_non_redundant_resource,
     mock_version_check,
+    shared_ngw_verifier,
 ):
     """Test that reboot/shutdown call appropriate checks."""
-    ngw_verifier = get_ngw_verifier()
-    ngw_verifier.verify_reboot()
+    shared_ngw_verifier.verify_reboot()
     assert mock_check_non_redundant_resource.call_count == 2
     mock_version_check.assert_called_once()
     mock_warn_router_ha.assert_called_once()
@@ -302,23 +266,22 @@ def test_verify_reboot_shutdown(
     mock_warn_router_ha.reset_mock()
     mock_warn_lbaas_preent.reset_mock()
 
-    ngw_verifier.verify_shutdown()
+    shared_ngw_verifier.verify_shutdown()
     mock_version_check.assert_called_once()
     mock_warn_router_ha.assert_called_once()
     assert mock_check_non_redundant_resource.call_count == 2
 
 
-@mock.patch("juju_verify.verifiers.neutron_gateway.run_action_on_unit")
-@mock.patch("juju_verify.verifiers.neutron_gateway.data_from_action")
+@mock.patch.object(neutron_gateway, "run_action_on_unit")
+@mock.patch.object(neutron_gateway, "data_from_action")
 def test_get_unit_resource_list(mock_data_from_action, mock_run_action_on_unit):
     """Test Neutron agent resources are retrieved via Juju actions."""
-    resource = {"routers": [{"id": "r1"}]}
-    mock_data_from_action.return_value = json.dumps(resource)
+    mock_data_from_action.return_value = router_resource_json
     resource_list = NeutronGateway.get_unit_resource_list(
         all_ngw_units[0], "show-routers"
     )
     mock_run_action_on_unit.assert_called_once()
-    assert resource == resource_list
+    assert router_resource == resource_list
 
 
 def test_get_all_gw_units(model):
@@ -377,26 +340,22 @@ def test_warn_lbaas_present_pass(mocker, model, units_with_lbaas, checked_units)
         assert result == Result()
 
 
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.check_minimum_version"
-)
-@mock.patch(
-    "juju_verify.verifiers.neutron_gateway.NeutronGateway.check_non_redundant_resource"
-)
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.warn_lbaas_present")
-@mock.patch("juju_verify.verifiers.neutron_gateway.NeutronGateway.warn_router_ha")
+@mock.patch.object(NeutronGateway, "check_minimum_version")
+@mock.patch.object(NeutronGateway, "check_non_redundant_resource")
+@mock.patch.object(NeutronGateway, "warn_lbaas_present")
+@mock.patch.object(NeutronGateway, "warn_router_ha")
 def test_too_old_juju_version(
     mock_warn_router_ha,
     mock_warn_lbaas_preent,
     mock_check_non_redundant_resource,
     mock_version_check,
+    shared_ngw_verifier,
 ):
     """Test that insufficient juju version stops check execution."""
     failed_version_check = Result(Severity.FAIL, "Juju version too low.")
     mock_version_check.return_value = failed_version_check
-    verifier = get_ngw_verifier()
 
-    result = verifier.verify_shutdown()
+    result = shared_ngw_verifier.verify_shutdown()
 
     assert result == failed_version_check
     mock_version_check.assert_called_once()